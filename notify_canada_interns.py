@@ -9,48 +9,222 @@ Fixes:
  - Extract links using BeautifulSoup anchors (returns normalized hrefs, no &amp; vs & mismatch)
  - Prefer non-simplify.jobs apply link when multiple anchors exist
  - Sub-rows (company == '↳') inherit last main-row company and application link
- - Normalize/unescape URLs when saving/loading notified.json to dedupe correctly
- - Persist notified.json immediately after each successful notification
+ - Canonicalize URLs (unescape, lowercase host, sorted query, ...) before hashing dedupe keys
+ - notified.jsonl stores 64-bit blake2b digests of dedupe keys, one per line
+   (a legacy notified.json array of URLs is migrated on first load)
+ - Persist notified.jsonl (append-only) immediately after each successful notification
 """
 import os
 import re
-import json
 import sys
+import time
+import threading
+import hashlib
 import html as html_module
-from typing import List, Dict, Optional
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import html as lxml_html
 
 RAW_README_URL = "https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/README.md"
-NOTIFIED_STORE = "notified.json"
+NOTIFIED_STORE = "notified.jsonl"
+LEGACY_NOTIFIED_STORE = "notified.json"  # pre-JSONL array store, migrated on first load
+README_CACHE = "readme_cache.json"
+PARSE_CACHE_DIR = "cache"  # candidate rows as JSON, one file per section digest
+PARSE_CACHE_MAX = 8  # cached sections kept; least recently used beyond this are evicted
 DISCORD_WEBHOOK_ENV = "DISCORD_WEBHOOK_URL"
+SECTION_KEYWORDS = ("Software Engineering Internship Roles", "Software Engineering")
+README_CHUNK_SIZE = 64 * 1024  # streamed README read size
+DISCORD_MAX_EMBEDS = 10  # Discord's per-message embed limit
+DISCORD_MAX_EMBED_CHARS = 6000  # Discord's per-message limit on total embed text
+DISCORD_MAX_TITLE = 256  # Discord's per-embed limits; one oversized embed fails the message
+DISCORD_MAX_DESCRIPTION = 4096
+DISCORD_MAX_FIELD_VALUE = 1024
+DISCORD_MAX_CONCURRENCY = 5  # webhook messages in flight at once
+
+# (headers, columns): columns[j][i] is row i's cell under headers[j]
+Table = Tuple[List[str], List[List[str]]]
+# one normalized candidate row: plain-text cells plus the extracted application link
+Posting = namedtuple("Posting", ["company", "role", "location", "age", "link"])
+
+
+def _build_session() -> requests.Session:
+    """
+    One keep-alive Session shared by the README fetch and every webhook POST (the pool is
+    sized so concurrent webhook workers don't discard connections).
+    Retry only covers idempotent methods (urllib3 default), so webhook POSTs are never
+    replayed blindly; their 429s are handled in send_discord_webhook_batch.
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    # one pool per host (raw.githubusercontent.com, discord.com); maxsize covers the webhook workers
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=max(10, DISCORD_MAX_CONCURRENCY), max_retries=retry))
+    return session
+
+
+SESSION = _build_session()
+# per-request (not session-wide) so the README GET doesn't carry a Content-Type
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_MD_LINK_RE = re.compile(r"\[.*?\]\((https?://[^\s)]+)\)")
+_HREF_RE = re.compile(r"href=[\"'](https?://[^\"']+)[\"']")
+_URL_RE = re.compile(r"https?://[^\s\)\]]+")
+_AGE_RE = re.compile(r"\b0\s*d(?:ays?)?\b", re.IGNORECASE)
+_SEP_RE = re.compile(r"^\s*-+\s*(\|\s*-+\s*)*$")
+_DIGEST_RE = re.compile(r"[0-9a-f]{16}")
+_MD_TABLE_LINE_RE = re.compile(r"^[ \t]*\|", re.MULTILINE)
+_TABLE_OPEN_RE = re.compile(r"<table", re.IGNORECASE)
+_TABLE_RE = re.compile(rb"(<table[\s\S]*?</table>)", re.IGNORECASE)
+# case-insensitive matches instead of lower()-ing every location / href
+_CANADA_RE = re.compile(r"canada", re.IGNORECASE)
+_ABS_URL_RE = re.compile(r"https?://", re.IGNORECASE)
+_SIMPLIFY_LINK_RE = re.compile(r"simplify\.jobs/p/", re.IGNORECASE)
+
+_ANCHOR_STRAINER = SoupStrainer("a", href=True)
+_TABLE_STRAINER = SoupStrainer(["table", "tr", "th", "td"])
+# HTML-table cells parse_html_table kept as raw markup (see build_normalized_rows)
+_RAW_CELL_PREFIXES = ("<td", "<th")
+
+
+def load_readme_cache(path=README_CACHE) -> Dict[str, Optional[str]]:
+    """
+    Load the conditional-GET sidecar ({etag, last_modified}); empty dict if missing/corrupt.
+    """
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+                if isinstance(data, dict):
+                    return data
+        except Exception:
+            return {}
+    return {}
 
 
-def fetch_readme_raw(url: str = RAW_README_URL, timeout: int = 15) -> str:
-    r = requests.get(url, timeout=timeout)
-    r.raise_for_status()
-    return r.text
+def save_readme_cache(cache: Dict[str, Optional[str]], path=README_CACHE):
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(cache))
 
 
-def find_section_markdown(md: str, section_heading_keywords: List[str]) -> Optional[str]:
-    lines = md.splitlines()
-    start_idx = None
-    for i, line in enumerate(lines):
-        for kw in section_heading_keywords:
-            if kw.lower() in line.lower():
-                start_idx = i
-                break
-        if start_idx is not None:
-            break
-    if start_idx is None:
+def fetch_readme_conditional(url: str = RAW_README_URL, cache_path=README_CACHE, timeout: int = 15) -> Tuple[Optional[requests.Response], bool]:
+    """
+    Fetch README with If-None-Match / If-Modified-Since validators from the sidecar cache.
+    Returns (unread streamed response, True) on 200 and (None, False) on 304; the caller
+    closes the stream and saves the new validators.
+    """
+    cache = load_readme_cache(cache_path)
+    headers = {}
+    if cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+    r = SESSION.get(url, headers=headers, timeout=timeout, stream=True)
+    if r.status_code == 304:
+        r.close()
+        return None, False
+    try:
+        r.raise_for_status()
+    except Exception:
+        r.close()
+        raise
+    return r, True
+
+
+def save_readme_validators(r: requests.Response, cache_path=README_CACHE):
+    save_readme_cache({"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}, cache_path)
+
+
+def _source_digest() -> bytes:
+    """
+    sha256 of this file. Cached rows are the output of its parsing code, so hashing it into
+    every cache key invalidates old entries whenever that code changes.
+    """
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+PARSE_CACHE_VERSION = _source_digest()
+
+
+def section_digest(section: str) -> str:
+    return hashlib.sha256(PARSE_CACHE_VERSION + section.encode("utf-8")).hexdigest()
+
+
+def load_parse_cache(digest: str, cache_dir=PARSE_CACHE_DIR) -> Optional[List[Posting]]:
+    """
+    Candidate rows previously parsed from a section with this digest; None on a miss or an
+    entry that isn't a list of well-formed Posting rows. A hit refreshes the entry's mtime,
+    which is the LRU order for eviction.
+    """
+    path = os.path.join(cache_dir, f"{digest}.json")
+    try:
+        with open(path, "rb") as f:
+            rows = orjson.loads(f.read())
+        if not isinstance(rows, list):
+            return None
+        postings = [Posting(*row) for row in rows]
+        if not all(all(isinstance(v, str) for v in p[:4]) and (p.link is None or isinstance(p.link, str)) for p in postings):
+            return None
+        os.utime(path)
+    except Exception:
         return None
-    for j in range(start_idx + 1, len(lines)):
-        if lines[j].startswith("#"):
-            end_idx = j
+    return postings
+
+
+def save_parse_cache(digest: str, postings: List[Posting], cache_dir=PARSE_CACHE_DIR, max_entries=PARSE_CACHE_MAX):
+    """
+    Store candidate rows for a section digest (written via a temp file, so a crash never
+    leaves a truncated entry), then evict least recently used entries beyond max_entries
+    along with any temp files an interrupted write left behind.
+    A cache that can't be written only costs a re-parse next run, so errors are reported, not raised.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, f"{digest}.json")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            # Postings are plain tuples of strings; orjson needs them as lists
+            f.write(orjson.dumps([list(p) for p in postings]))
+        os.replace(tmp, path)
+        names = os.listdir(cache_dir)
+        entries = [os.path.join(cache_dir, n) for n in names if n.endswith(".json")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        # temp files left behind by a crashed earlier write
+        orphans = [os.path.join(cache_dir, n) for n in names if n.endswith(".json.tmp")]
+        for old in entries[max_entries:] + orphans:
+            os.remove(old)
+    except Exception as e:
+        print("WARNING: could not update parse cache:", e, file=sys.stderr)
+
+
+def find_section_markdown(lines: Iterator[bytes], section_heading_keywords: Iterable[str]) -> Optional[str]:
+    """
+    Consume raw README lines up to the first '#' heading mentioning any keyword, then collect
+    its body until the next heading and stop — the iterator is left positioned after that
+    heading, so nothing past the section has to be read. Only heading lines are lowercased
+    and only the section is decoded.
+    """
+    keywords = tuple(k.lower().encode("utf-8") for k in section_heading_keywords)
+    section = None
+    for line in lines:
+        if section is None:
+            if line.startswith(b"#"):
+                lowered = line.lower()
+                if any(kw in lowered for kw in keywords):
+                    section = [line]
+        elif line.startswith(b"#"):
             break
-    else:
-        end_idx = len(lines)
-    return "\n".join(lines[start_idx:end_idx])
+        else:
+            section.append(line)
+    return b"\n".join(section).decode("utf-8", "replace") if section is not None else None
 
 
 def extract_first_markdown_table(section_md: str) -> Optional[List[str]]:
@@ -66,182 +240,529 @@ def extract_first_markdown_table(section_md: str) -> Optional[List[str]]:
     return table_lines or None
 
 
-def parse_markdown_table(table_lines: List[str]) -> List[Dict[str, str]]:
-    cleaned = [ln.strip().strip("|").strip() for ln in table_lines if ln.strip()]
+def parse_markdown_table_soa(table_lines: List[str], prefilter: bool = False) -> Table:
+    """
+    Parse a pipe-table column-wise: returns (headers, columns) where columns[j][i] is the
+    cell of row i under headers[j]. No per-row dict is built.
+    prefilter=True drops rows that cannot be Canada / 0d candidates before any per-cell work
+    (see _maybe_candidate).
+    """
+    cleaned = [ln for ln in (line.strip().strip("|").strip() for line in table_lines) if ln]
     if len(cleaned) < 2:
-        return []
-    header_row = cleaned[0]
-    if re.match(r"^\s*-+\s*(\|\s*-+\s*)*$", cleaned[1]):
-        data_rows = cleaned[2:]
+        return [], []
+    headers = [h.strip() for h in cleaned[0].split("|")]
+    n = len(headers)
+    start = 2 if _SEP_RE.match(cleaned[1]) else 1
+    columns = [[] for _ in headers]
+    for row in cleaned[start:]:
+        if prefilter and not _maybe_candidate(row):
+            continue
+        # cells past the n-th header are dropped anyway, so stop splitting there
+        cells = row.split("|", n)
+        if len(cells) < n:
+            cells.extend([""] * (n - len(cells)))
+        for col, cell in zip(columns, cells):
+            col.append(cell.strip())
+    return headers, columns
+
+
+def parse_html_table(html_fragment: str, prefilter: bool = False) -> Optional[Table]:
+    """
+    Walk the first <table> with lxml directly (no BeautifulSoup tree). Returns
+    (headers, columns); cells containing an <a> keep their raw HTML so anchors survive for
+    link extraction, all other cells are stored as plain text.
+    BeautifulSoup is only used as a fallback when lxml rejects the fragment.
+    prefilter=True drops rows whose visible text has no Canada / 0d match before their cells
+    are touched (see _maybe_candidate).
+    """
+    try:
+        root = lxml_html.fromstring(html_fragment)
+    except Exception:
+        return _parse_html_table_bs4(html_fragment, prefilter)
+    table = root if root.tag == "table" else root.find(".//table")
+    if table is None:
+        return None
+    all_trs = list(table.iter("tr"))
+    ths = list(table.iter("th"))
+    if ths:
+        headers = [th.text_content().strip() for th in ths]
     else:
-        data_rows = cleaned[1:]
-    headers = [h.strip() for h in header_row.split("|")]
-    out = []
-    for row in data_rows:
-        cells = [c.strip() for c in row.split("|")]
-        while len(cells) < len(headers):
-            cells.append("")
-        out.append({headers[i]: cells[i] for i in range(len(headers))})
-    return out
-
-
-def parse_html_table(html_fragment: str) -> Optional[List[Dict[str, str]]]:
-    soup = BeautifulSoup(html_fragment, "lxml")
+        if not all_trs:
+            return None
+        headers = [cell.text_content().strip() for cell in _row_cells(all_trs[0])]
+    columns = [[] for _ in headers]
+    start_idx = 1 if all_trs and all_trs[0].find("th") is not None else 0
+    for tr in all_trs[start_idx:]:
+        # join text nodes with spaces so cell borders stay word boundaries for _AGE_RE
+        if prefilter and not _maybe_candidate(" ".join(tr.itertext())):
+            continue
+        cells = _row_cells(tr)
+        if not cells:
+            continue
+        for j, col in enumerate(columns):
+            if j >= len(cells):
+                col.append("")
+            elif cells[j].find(".//a") is not None:
+                # keep raw HTML only where a link has to be extracted later
+                col.append(lxml_html.tostring(cells[j], encoding="unicode", with_tail=False).strip())
+            else:
+                col.append(cells[j].text_content().strip())
+    return headers, columns
+
+
+def _parse_html_table_bs4(html_fragment: str, prefilter: bool = False) -> Optional[Table]:
+    """
+    Slow path for HTML lxml.html refuses: same output shape as parse_html_table, with the
+    soup limited to table nodes (and their contents) by a SoupStrainer.
+    """
+    soup = BeautifulSoup(html_fragment, "html.parser", parse_only=_TABLE_STRAINER)
     table = soup.find("table")
     if not table:
         return None
+    all_trs = table.find_all("tr")
     ths = table.find_all("th")
     if ths:
-        headers = [th.get_text(strip=True) for th in ths]
+        headers = [th.get_text().strip() for th in ths]
     else:
-        first_tr = table.find("tr")
-        if not first_tr:
+        if not all_trs:
             return None
-        headers = [cell.get_text(strip=True) for cell in first_tr.find_all(["td", "th"])]
-    rows = []
-    all_trs = table.find_all("tr")
-    start_idx = 1 if all_trs and all_trs[0].find_all("th") else 0
+        headers = [cell.get_text().strip() for cell in all_trs[0].find_all(["td", "th"], recursive=False)]
+    columns = [[] for _ in headers]
+    start_idx = 1 if all_trs and all_trs[0].find("th") else 0
     for tr in all_trs[start_idx:]:
-        cells = tr.find_all(["td", "th"])
+        if prefilter and not _maybe_candidate(tr.get_text(" ")):
+            continue
+        cells = tr.find_all(["td", "th"], recursive=False)
         if not cells:
             continue
-        cell_raw = [str(cell) for cell in cells]
-        cell_text = [cell.get_text(strip=True) for cell in cells]
-        while len(cell_raw) < len(headers):
-            cell_raw.append("")
-            cell_text.append("")
-        # store raw HTML string for each header (keeps anchors), plain text will be derived later
-        rows.append({headers[i]: cell_raw[i].strip() for i in range(len(headers))})
-    return rows
+        for j, col in enumerate(columns):
+            if j >= len(cells):
+                col.append("")
+            elif cells[j].find("a"):
+                col.append(str(cells[j]).strip())
+            else:
+                col.append(cells[j].get_text().strip())
+    return headers, columns
+
+
+def _maybe_candidate(row_text: str) -> bool:
+    """
+    Whole-row precheck: keep a row only if row_text mentions Canada and carries a 0-day age.
+    Markdown rows pass their raw line (link URLs included), so nothing iter_candidate_rows
+    would accept is dropped. HTML rows pass their visible text only, so a row whose "canada"
+    appears only inside an attribute (e.g. an href) is dropped. That matches the baseline
+    text-based location_is_canada check, even though the raw <a> cell would match it.
+    """
+    return _CANADA_RE.search(row_text) is not None and _AGE_RE.search(row_text) is not None
+
+
+def table_row_count(table: Optional[Table]) -> int:
+    return len(table[1][0]) if table and table[1] else 0
+
+
+def _row_cells(tr) -> list:
+    return [cell for cell in tr if cell.tag in ("td", "th")]
 
 
 def strip_html_tags(text: str) -> str:
+    """
+    Plain-text content of a cell. Cells without markup (the common case for markdown rows)
+    only need their entities unescaped; cells with ordinary inline tags (<a>, <br>, <strong>)
+    are stripped with a regex. Only cells with comments, CDATA, or script/style blocks — whose
+    text a regex can't separate from markup — pay for an lxml fragment parse.
+    """
     if not isinstance(text, str):
         return ""
-    return BeautifulSoup(text, "lxml").get_text(strip=True)
+    if "<" not in text:
+        return html_module.unescape(text).strip() if "&" in text else text.strip()
+    lowered = text.lower()
+    if "<!" not in text and "<script" not in lowered and "<style" not in lowered:
+        # tags become spaces so <br>-separated values don't run together
+        return _WS_RE.sub(" ", html_module.unescape(_TAG_RE.sub(" ", text))).strip()
+    try:
+        return lxml_html.fragment_fromstring(text, create_parent="div").text_content().strip()
+    except Exception:
+        # unparsable fragment: fall back to dropping anything tag-shaped
+        return html_module.unescape(_TAG_RE.sub("", text)).strip()
 
 
 def normalize_url(url: str) -> str:
     """
-    Basic normalization: unescape HTML entities and strip whitespace.
-    (We intentionally avoid heavy URL canonicalization to keep behavior predictable.)
+    Display form of a link: unescape HTML entities and strip whitespace. Dedupe keys use
+    the stricter canonicalize_url() form instead.
     """
     if not isinstance(url, str):
         return ""
     return html_module.unescape(url).strip()
 
 
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form used only for dedupe keys (links shown in Discord keep normalize_url's form):
+    lowercase scheme/host, default ports dropped, trailing '/' dropped, query pairs sorted,
+    fragment removed. Strings that aren't absolute URLs (fallback keys) are just normalized.
+    """
+    url = normalize_url(url)
+    try:
+        u = urlsplit(url)
+        port = u.port
+    except ValueError:
+        return url
+    if not u.scheme or not u.netloc:
+        return url
+    netloc = u.hostname or ""
+    if port is not None and port not in (80, 443):
+        netloc += f":{port}"
+    path = u.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(u.query, keep_blank_values=True)))
+    return urlunsplit((u.scheme.lower(), netloc, path, query, ""))
+
+
 def extract_link_from_cell(cell_text_or_html: str) -> Optional[str]:
     """
-    Prefer extracting href from anchor tags (BeautifulSoup), picking a sensible anchor:
+    Prefer extracting href from anchor tags (BeautifulSoup, <a href> only), picking a sensible anchor:
       - Prefer anchors not pointing to simplify.jobs/p (the repo's internal simplify link)
       - Otherwise return the first absolute http(s) href found
     Fallbacks to regex if no <a> tags exist.
     Returned URL is normalized (HTML-unescaped).
+    Cheap substring checks gate each step, so cells without links return without any parsing.
     """
-    if not cell_text_or_html:
+    # every branch below needs an absolute http(s) URL
+    if not cell_text_or_html or "http" not in cell_text_or_html:
         return None
 
-    try:
-        bs = BeautifulSoup(cell_text_or_html, "lxml")
-        anchors = bs.find_all("a", href=True)
-        if anchors:
-            # prefer anchors that don't point to simplify.jobs/p/ (these are "simplify" shortlinks)
-            for a in anchors:
-                href = a.get("href", "").strip()
-                if href and href.lower().startswith(("http://", "https://")) and "simplify.jobs/p/" not in href.lower():
-                    return normalize_url(href)
-            # otherwise return first absolute href available
-            for a in anchors:
-                href = a.get("href", "").strip()
-                if href and href.lower().startswith(("http://", "https://")):
-                    return normalize_url(href)
-    except Exception:
-        pass
+    # plain markdown cells ([text](url) or a bare URL) carry no anchor tag: skip the soup entirely
+    if "<a" in cell_text_or_html or "<A" in cell_text_or_html:
+        try:
+            # only <a href> nodes are materialized; everything else in the cell is skipped
+            bs = BeautifulSoup(cell_text_or_html, "lxml", parse_only=_ANCHOR_STRAINER)
+            anchors = bs.find_all("a", href=True)
+            if anchors:
+                # prefer anchors that don't point to simplify.jobs/p/ (these are "simplify" shortlinks)
+                for a in anchors:
+                    href = a.get("href", "").strip()
+                    if href and _ABS_URL_RE.match(href) and not _SIMPLIFY_LINK_RE.search(href):
+                        return normalize_url(href)
+                # otherwise return first absolute href available
+                for a in anchors:
+                    href = a.get("href", "").strip()
+                    if href and _ABS_URL_RE.match(href):
+                        return normalize_url(href)
+        except Exception:
+            pass
 
     # Fallback: markdown-style [text](url)
-    m = re.search(r'\[.*?\]\((https?://[^\s)]+)\)', cell_text_or_html)
-    if m:
-        return normalize_url(m.group(1))
+    if "](" in cell_text_or_html:
+        m = _MD_LINK_RE.search(cell_text_or_html)
+        if m:
+            return normalize_url(m.group(1))
 
     # regex href capture (may contain &amp; etc.)
-    m = re.search(r'href=["\'](https?://[^"\']+)["\']', cell_text_or_html)
-    if m:
-        return normalize_url(html_module.unescape(m.group(1)))
+    if "href=" in cell_text_or_html:
+        m = _HREF_RE.search(cell_text_or_html)
+        if m:
+            return normalize_url(html_module.unescape(m.group(1)))
 
     # fallback: any bare http(s) URL
-    m = re.search(r"(https?://[^\s\)\]]+)", cell_text_or_html)
+    m = _URL_RE.search(cell_text_or_html)
     if m:
-        return normalize_url(m.group(1))
+        return normalize_url(m.group(0))
 
     return None
 
 
-def location_is_canada(location_text: str) -> bool:
-    if not location_text:
-        return False
-    txt = strip_html_tags(location_text).lower()
-    return "canada" in txt  # strict: must contain 'canada'
+def notified_key(key: str) -> str:
+    """
+    64-bit blake2b digest (16 hex chars) of a normalized dedupe key; this is what notified.jsonl stores.
+    """
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
 
 
-def load_notified(path=NOTIFIED_STORE) -> set:
+def load_notified(path=NOTIFIED_STORE, legacy_path=LEGACY_NOTIFIED_STORE) -> set:
     """
-    Load notified.json if present. Normalize (unescape) stored strings so dedupe matches current normalized URLs.
+    Load notified.jsonl (one JSON string per line, digests are already normalized+hashed at
+    insert time, so lines are taken as-is) and return the set of key digests.
+    If only the legacy notified.json array exists, it is migrated once: digests are computed
+    for its entries, notified.jsonl is written and the legacy file removed.
+    Duplicate or unreadable lines trigger a compaction (sorted, deduped rewrite).
     """
-    if os.path.exists(path):
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    return set(normalize_url(x) for x in data if isinstance(x, str))
-        except Exception:
+    if (not os.path.exists(path) or os.path.getsize(path) == 0) and os.path.exists(legacy_path):
+        notified = _load_legacy_notified(legacy_path)
+        if notified is None:
+            # unreadable legacy file: leave it in place rather than migrating nothing over it
             return set()
-    return set()
+        save_notified(notified, path)
+        os.remove(legacy_path)
+        return notified
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb") as f:
+        lines = [line for line in f.read().split(b"\n") if line.strip()]
+    try:
+        # one orjson call for the whole store: the lines are joined into a single JSON array
+        keys = orjson.loads(b"[" + b",".join(lines) + b"]")
+    except orjson.JSONDecodeError:
+        # some line is unreadable (e.g. a torn append); decode line by line to drop just that one
+        keys = []
+        for line in lines:
+            try:
+                keys.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+    notified = {key for key in keys if isinstance(key, str)}
+    if len(lines) != len(notified):
+        save_notified(notified, path)
+    return notified
+
+
+def _load_legacy_notified(path: str) -> Optional[set]:
+    """
+    Read the old JSON-array notified.json; full URLs / fallback keys are canonicalized and hashed.
+    Returns None if the file can't be parsed as a list.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    except Exception:
+        return None
+    if not isinstance(data, list):
+        return None
+    return set(
+        x if _DIGEST_RE.fullmatch(x) else notified_key(canonicalize_url(x))
+        for x in data
+        if isinstance(x, str)
+    )
 
 
 def save_notified(notified: set, path=NOTIFIED_STORE):
     """
-    Save sorted normalized list to disk for deterministic artifacts.
+    Rewrite the whole store as sorted JSONL (used for migration/compaction only; normal runs
+    append via append_notified).
+    Written to a temp file, fsynced, then os.replace()d so a crash mid-write never
+    leaves a truncated store behind.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.writelines(orjson.dumps(key) + b"\n" for key in sorted(notified))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def append_notified(keys: Iterable[str], path=NOTIFIED_STORE):
+    """
+    Append newly notified digests; the existing lines are never read back or rewritten.
     """
-    with open(path, "w") as f:
-        json.dump(sorted(list(normalize_url(x) for x in notified)), f, indent=2)
+    with open(path, "ab") as f:
+        f.writelines(orjson.dumps(key) + b"\n" for key in keys)
+        f.flush()
+        os.fsync(f.fileno())
 
 
-def build_normalized_rows(raw_rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+def iter_candidate_rows(columns: List[List[str]], location_idx: Optional[int], age_idx: Optional[int]) -> Iterator[int]:
+    """
+    Yield indices of rows whose location mentions Canada and whose age is 0 days.
+    Runs on the raw cells (tag names never contain "canada"), so the far more numerous
+    rejected rows are never stripped/normalized.
     """
-    Build rows with both text-only and raw variants:
-      - 'Header' => text-only string
-      - 'Header_raw' => raw HTML (if provided by HTML parsing) or original string
+    if location_idx is None or age_idx is None:
+        return
+    locations = columns[location_idx]
+    ages = columns[age_idx]
+    for i in range(len(locations)):
+        raw_loc = locations[i]
+        if not raw_loc or not _CANADA_RE.search(raw_loc):
+            continue
+        raw_age = ages[i]
+        # Strict age match: accept "0d", "0 d", "0 days" (case-insensitive)
+        if not raw_age or not _AGE_RE.search(raw_age):
+            continue
+        yield i
+
+
+def build_normalized_rows(
+    columns: List[List[str]],
+    row_indices: Iterable[int],
+    source: str = "html",
+    *,
+    company_idx: Optional[int],
+    role_idx: Optional[int],
+    location_idx: Optional[int],
+    age_idx: Optional[int],
+    link_idx: Optional[int],
+) -> List[Posting]:
     """
-    normalized = []
-    for r in raw_rows:
-        row = {}
-        for k, v in r.items():
-            if isinstance(v, str) and ("<" in v and ">" in v and "href" in v):
-                # raw HTML from parse_html_table
-                row[f"{k}_raw"] = v
-                row[k] = strip_html_tags(v)
+    Build a Posting (plain company/role/location/age text plus the extracted application
+    link) for each of the given row indices; a missing column yields "" / None.
+    Only the five columns main() uses are touched, and each of their cells is parsed exactly
+    once: the link column only needs its link (its text is never shown), the others only
+    need their text.
+    source="markdown": cells are already stripped by the parser and usually plain text, so
+    only cells carrying inline HTML/entities (e.g. <a>, <br>, &amp;) go through strip_html_tags.
+    source="html": parse_html_table already stored most cells as decoded text; only the cells
+    it kept as raw <td>/<th> fragments (those with an <a>) are stripped, so entities such as
+    &amp;amp; or &lt;b&gt; are never decoded twice.
+    """
+    markdown = source == "markdown"
+    text_columns = [columns[j] if j is not None else None for j in (company_idx, role_idx, location_idx, age_idx)]
+    link_column = columns[link_idx] if link_idx is not None else None
+    postings = []
+    for i in row_indices:
+        texts = []
+        for col in text_columns:
+            if col is None:
+                texts.append("")
+                continue
+            v = col[i]
+            if markdown:
+                texts.append(v if "<" not in v and "&" not in v else strip_html_tags(v))
             else:
-                row[k] = strip_html_tags(v)
-                row[f"{k}_raw"] = v
-        normalized.append(row)
-    return normalized
-
-
-def send_discord_webhook(webhook_url: str, title: str, description: str, url: Optional[str], fields: List[Dict[str, str]]):
-    payload = {
-        "embeds": [
-            {
-                "title": title,
-                "description": description,
-                "url": url or None,
-                "fields": fields,
-            }
-        ]
-    }
-    headers = {"Content-Type": "application/json"}
-    r = requests.post(webhook_url, json=payload, headers=headers, timeout=10)
-    r.raise_for_status()
+                texts.append(strip_html_tags(v) if v.startswith(_RAW_CELL_PREFIXES) else v)
+        link = extract_link_from_cell(link_column[i]) if link_column is not None else None
+        postings.append(Posting(*texts, link))
+    return postings
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: up to `capacity` calls back-to-back, then `rate` calls/second.
+    Shared by the webhook workers so the pool never outruns Discord's webhook rate limit.
+    """
+
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Discord webhooks: short bursts are fine, sustained rate is ~30 messages/minute
+DISCORD_RATE_LIMITER = TokenBucket(capacity=DISCORD_MAX_CONCURRENCY, rate=30 / 60)
+
+
+def send_discord_webhook_batch(webhook_url: str, embeds: List[dict], max_attempts: int = 3) -> List[bool]:
+    """
+    POST up to DISCORD_MAX_EMBEDS embeds as one webhook message, paced by DISCORD_RATE_LIMITER.
+    On 429, waits for Discord's `retry_after` (seconds, from the JSON body, else the
+    Retry-After header) and retries. On 400 a multi-embed batch is resent one embed at a
+    time, so a single rejected posting can't block its neighbours.
+    Returns one delivered flag per embed.
+    """
+    embeds = embeds[:DISCORD_MAX_EMBEDS]
+    body = orjson.dumps({"embeds": embeds})
+    for attempt in range(max_attempts):
+        DISCORD_RATE_LIMITER.acquire()
+        r = SESSION.post(webhook_url, data=body, headers=_JSON_HEADERS, timeout=10)
+        if r.status_code == 429 and attempt + 1 < max_attempts:
+            try:
+                retry_after = float(r.json().get("retry_after", 1))
+            except Exception:
+                try:
+                    retry_after = float(r.headers.get("Retry-After", 1))
+                except ValueError:
+                    retry_after = 1.0
+            time.sleep(retry_after)
+            continue
+        if r.status_code == 400 and len(embeds) > 1:
+            delivered = []
+            for embed in embeds:
+                try:
+                    send_discord_webhook_batch(webhook_url, [embed], max_attempts)
+                    delivered.append(True)
+                except Exception as e:
+                    print(f"Discord rejected embed {embed.get('title')!r}:", e, file=sys.stderr)
+                    delivered.append(False)
+            return delivered
+        r.raise_for_status()
+        return [True] * len(embeds)
+
+
+def clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def embed_size(embed: dict) -> int:
+    """
+    Characters Discord counts toward the per-message embed total.
+    """
+    size = len(embed.get("title") or "") + len(embed.get("description") or "")
+    for field in embed.get("fields") or ():
+        size += len(field.get("name") or "") + len(field.get("value") or "")
+    return size
+
+
+def postings_from_table(table: Table, table_format: str) -> List[Posting]:
+    """
+    Resolve the columns main() needs from the table headers, then normalize the Canada / 0d
+    candidate rows into Postings.
+    """
+    headers, columns = table
+
+    # resolve column indices once (one lower() per header, first match wins per column);
+    # the row scan then indexes straight into column lists
+    application_idx = location_idx = company_idx = role_idx = age_idx = None
+    for i, lo in enumerate(h.lower() for h in headers):
+        if application_idx is None and ("apply" in lo or "application" in lo):
+            application_idx = i
+        if location_idx is None and "location" in lo:
+            location_idx = i
+        if company_idx is None and "company" in lo:
+            company_idx = i
+        if role_idx is None and ("role" in lo or "position" in lo):
+            role_idx = i
+        if age_idx is None and "age" in lo:
+            age_idx = i
+    if company_idx is None:
+        company_idx = 0
+    if role_idx is None and len(headers) > 1:
+        role_idx = 1
+
+    # filter on raw cells first; only Canada / 0d rows get stripped and normalized
+    return build_normalized_rows(
+        columns,
+        iter_candidate_rows(columns, location_idx, age_idx),
+        source=table_format,
+        company_idx=company_idx,
+        role_idx=role_idx,
+        location_idx=location_idx,
+        age_idx=age_idx,
+        link_idx=application_idx,
+    )
+
+
+def chunk_pending_embeds(pending: List[Tuple[str, dict, str]]) -> List[List[Tuple[str, dict, str]]]:
+    """
+    Group queued (key, embed, summary) items into webhook messages, in order, staying within
+    both DISCORD_MAX_EMBEDS embeds and DISCORD_MAX_EMBED_CHARS total characters per message
+    (Discord rejects the whole message — every posting in it — if either is exceeded).
+    """
+    chunks = []
+    current = []
+    current_size = 0
+    for item in pending:
+        size = embed_size(item[1])
+        if current and (len(current) >= DISCORD_MAX_EMBEDS or current_size + size > DISCORD_MAX_EMBED_CHARS):
+            chunks.append(current)
+            current = []
+            current_size = 0
+        current.append(item)
+        current_size += size
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 def main():
@@ -251,129 +772,152 @@ def main():
         sys.exit(2)
 
     print("Fetching README...", RAW_README_URL)
-    md = fetch_readme_raw(RAW_README_URL)
-
-    section = find_section_markdown(md, ["Software Engineering Internship Roles", "Software Engineering"])
-    if not section:
-        print("Could not find Software Engineering section.", file=sys.stderr)
-        sys.exit(1)
-
-    table_lines = extract_first_markdown_table(section)
-    rows = []
-    if table_lines:
-        print("DEBUG: Found markdown table.")
-        rows = parse_markdown_table(table_lines)
-    else:
-        print("DEBUG: Trying HTML parsing of the section.")
-        html_rows = parse_html_table(section)
-        if html_rows:
-            print(f"DEBUG: Found HTML table in section ({len(html_rows)} rows).")
-            rows = html_rows
-        else:
-            m = re.search(r"(<table[\s\S]*?</table>)", md, re.IGNORECASE)
-            if m:
-                parsed_any = parse_html_table(m.group(1))
-                if parsed_any:
-                    print(f"DEBUG: Found HTML table anywhere in README ({len(parsed_any)} rows).")
-                    rows = parsed_any
-
-    if not rows:
-        print("No table rows found.", file=sys.stderr)
+    readme, changed = fetch_readme_conditional(RAW_README_URL)
+    if not changed:
+        print("README not modified since last run (304) — no change.")
         sys.exit(0)
 
-    normalized_rows = build_normalized_rows(rows)
-
-    # derive human headers (exclude *_raw keys)
-    headers = list(normalized_rows[0].keys())
-    human_headers = [h for h in headers if not h.endswith("_raw")]
-
-    application_header = next((h for h in human_headers if "apply" in h.lower() or "application" in h.lower()), None)
-    location_header = next((h for h in human_headers if "location" in h.lower()), None)
-    company_header = next((h for h in human_headers if "company" in h.lower()), human_headers[0] if human_headers else "Company")
-    role_header = next((h for h in human_headers if "role" in h.lower() or "position" in h.lower()), human_headers[1] if len(human_headers) > 1 else "Role")
-    age_header = next((h for h in human_headers if "age" in h.lower()), None)
-
-    notified = load_notified()
-    newly_notified = []
+    # leaving this block closes the stream: whatever follows the section is never downloaded
+    with readme:
+        lines = readme.iter_lines(chunk_size=README_CHUNK_SIZE)
+        section = find_section_markdown(lines, SECTION_KEYWORDS)
+        if not section:
+            print("Could not find Software Engineering section.", file=sys.stderr)
+            sys.exit(1)
+
+        # the section text fully determines the candidate rows; reuse them if it hasn't changed
+        digest = section_digest(section)
+        postings = load_parse_cache(digest)
+        table = None
+        table_format = "html"
+        if postings is not None:
+            print(f"DEBUG: Section unchanged, reusing {len(postings)} cached candidate rows.")
+        # decide the table format once with cheap sniffs, then run only the matching parser
+        elif _MD_TABLE_LINE_RE.search(section):
+            print("DEBUG: Found markdown table.")
+            table = parse_markdown_table_soa(extract_first_markdown_table(section) or [], prefilter=True)
+            table_format = "markdown"
+        elif _TABLE_OPEN_RE.search(section):
+            table = parse_html_table(section, prefilter=True)
+            if table:
+                print(f"DEBUG: Found HTML table in section ({table_row_count(table)} candidate rows).")
+        else:
+            # rare layout: no table inside the section itself, take the first one after it;
+            # the section digest doesn't cover that table, so its rows are never cached
+            digest = None
+            m = _TABLE_RE.search(b"\n".join(lines))
+            if m:
+                table = parse_html_table(m.group(1).decode("utf-8", "replace"), prefilter=True)
+                if table:
+                    print(f"DEBUG: Found HTML table later in README ({table_row_count(table)} candidate rows).")
+
+    if postings is None:
+        # a table whose rows were all prefiltered out is fine; only a missing table is an error
+        if not table or not table[0]:
+            print("No table found.", file=sys.stderr)
+            sys.exit(0)
+        postings = postings_from_table(table, table_format)
+        if digest:
+            save_parse_cache(digest, postings)
+
+    # already-notified keys never change during the run; keys sent this run go in new_keys
+    already = frozenset(load_notified())
+    new_keys = set()
+    failed = 0
+    # (key, embed, log line) for postings to send once the scan is done
+    pending = []
+    pending_keys = set()
 
     last_valid_link = None
     previous_company = None
 
-    for item in normalized_rows:
-        location = item.get(location_header, "")
-        age = item.get(age_header, "")
+    for item in postings:
+        # posting fields are already plain, stripped text — nothing below re-strips them
+        company = item.company
+        is_subrow = company == "↳"
+        is_main_row = bool(company) and not is_subrow
 
-        # Only rows that explicitly say "Canada" in the location text
-        if not location_is_canada(location):
-            continue
+        # link was extracted from the raw application cell (preserves anchors) during normalization
+        current_link = item.link
 
-        # Strict age match: accept "0d", "0 d", "0 days" (case-insensitive)
-        if not age or not re.search(r"\b0\s*d\b|\b0\s*days?\b", age.lower()):
-            continue
-
-        # Prefer raw application cell (preserves anchors)
-        app_raw_key = (application_header + "_raw") if application_header else None
-        app_raw_val = item.get(app_raw_key or "", "") if app_raw_key else ""
-        current_link = extract_link_from_cell(app_raw_val) or extract_link_from_cell(item.get(application_header or "", ""))
-
-        company_text_raw = item.get(company_header, "")
-        company_text_stripped = strip_html_tags(company_text_raw).strip() if company_text_raw else ""
-
-        # Track previous main-row company (for sub-rows that display '↳')
-        if company_text_stripped and company_text_stripped != "↳":
-            previous_company = company_text_stripped
-
-        # If main row and has a link, update last_valid_link (so sub-rows inherit it)
-        if company_text_stripped and company_text_stripped != "↳" and current_link:
-            last_valid_link = current_link
+        # Track previous main-row company (for sub-rows that display '↳');
+        # a main row with a link also becomes the link sub-rows inherit
+        if is_main_row:
+            previous_company = company
+            if current_link:
+                last_valid_link = current_link
 
         # For sub-rows, fall back to last_valid_link if current is missing
         link = current_link or last_valid_link
 
+        # sub-rows display (and key on) the previous main-row company when there is one
+        company_display = previous_company if is_subrow and previous_company else company
+
         # Build dedupe key:
         if link:
-            key = normalize_url(link)
+            key = notified_key(canonicalize_url(link))
         else:
-            # If this is a sub-row '↳' and previous_company is available, use it, otherwise company_text_stripped
-            comp_for_key = previous_company if company_text_stripped == "↳" and previous_company else company_text_stripped
-            role_text = (item.get(role_header, "") or "").strip()
-            loc_text = strip_html_tags(location).strip()
-            key = normalize_url(f"{comp_for_key}|{role_text}|{loc_text}")
-
-        # Skip if already notified
-        if key in notified:
+            key = notified_key(canonicalize_url(f"{company_display}|{item.role}|{item.location}"))
+
+        # Skip if already notified (or already queued by an earlier row this run)
+        if key in already or key in pending_keys:
             continue
 
-        # Compose message fields (use previous_company for subrows)
-        company_display = previous_company if company_text_stripped == "↳" and previous_company else company_text_stripped
-        role_display = strip_html_tags(item.get(role_header, ""))
-        loc_display = strip_html_tags(location)
-        age_display = age or ""
+        role_display = item.role
+        loc_display = item.location
+        age_display = item.age
 
+        # clipped to Discord's per-embed limits (e.g. a <details> list of 90 cities as location)
         fields = [
-            {"name": "Company", "value": company_display or "—", "inline": True},
-            {"name": "Role", "value": role_display or "—", "inline": True},
-            {"name": "Location", "value": loc_display or "—", "inline": True},
-            {"name": "Age", "value": age_display or "—", "inline": True},
+            {"name": "Company", "value": clip(company_display or "—", DISCORD_MAX_FIELD_VALUE), "inline": True},
+            {"name": "Role", "value": clip(role_display or "—", DISCORD_MAX_FIELD_VALUE), "inline": True},
+            {"name": "Location", "value": clip(loc_display or "—", DISCORD_MAX_FIELD_VALUE), "inline": True},
+            {"name": "Age", "value": clip(age_display or "—", DISCORD_MAX_FIELD_VALUE), "inline": True},
         ]
-        description = f"[Click to apply]({link})" if link else "Application link not found."
-        title = f"New Canada Software Engineering Intern — {company_display or 'Unknown'}"
-
-        try:
-            send_discord_webhook(webhook_url, title=title, description=description, url=link, fields=fields)
-            print(f"Notified: {company_display} — {role_display} — {loc_display}")
-            # persist immediately — ensure saved values are normalized
-            notified.add(key)
-            save_notified(notified)
-            newly_notified.append(key)
-        except Exception as e:
-            print("Failed sending webhook for", company_display, ":", e, file=sys.stderr)
-
-    if newly_notified:
-        print(f"Saved {len(newly_notified)} new notified items.")
+        description = clip(f"[Click to apply]({link})" if link else "Application link not found.", DISCORD_MAX_DESCRIPTION)
+        title = clip(f"New Canada Software Engineering Intern — {company_display or 'Unknown'}", DISCORD_MAX_TITLE)
+
+        embed = {"title": title, "description": description, "url": link or None, "fields": fields}
+        pending.append((key, embed, f"{company_display} — {role_display} — {loc_display}"))
+        pending_keys.add(key)
+
+    # one webhook message per <= DISCORD_MAX_EMBEDS postings, up to DISCORD_MAX_CONCURRENCY in flight
+    chunks = chunk_pending_embeds(pending)
+    with ThreadPoolExecutor(max_workers=DISCORD_MAX_CONCURRENCY) as pool:
+        futures = {pool.submit(send_discord_webhook_batch, webhook_url, [embed for _, embed, _ in chunk]): chunk for chunk in chunks}
+        for fut in as_completed(futures):
+            chunk = futures[fut]
+            try:
+                delivered = fut.result()
+            except Exception as e:
+                print(f"Failed sending webhook for {len(chunk)} postings:", e, file=sys.stderr)
+                failed += 1
+                continue
+            # pending_keys already made every queued key unique and new
+            added = []
+            for (key, _, summary), ok in zip(chunk, delivered):
+                if not ok:
+                    print(f"Failed sending: {summary}", file=sys.stderr)
+                    failed += 1
+                    continue
+                print(f"Notified: {summary}")
+                added.append(key)
+            new_keys.update(added)
+            # persist after every successful message (main thread only); a batch whose embeds
+            # were all rejected has nothing to append
+            if added:
+                append_notified(added)
+
+    if new_keys:
+        print(f"Saved {len(new_keys)} new notified items.")
     else:
         print("No new Canada postings to notify.")
 
+    # only now is this README revision fully handled; after a failed send the validators stay
+    # stale so the next run gets a 200 again and retries the unsent postings
+    if not failed:
+        save_readme_validators(readme)
+
 
 if __name__ == "__main__":
     main()